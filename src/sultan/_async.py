@@ -0,0 +1,42 @@
+"""
+The coroutine behind `Sultan.run_async()`. It is kept apart from `sultan.api`
+since 'async def' can't be parsed by Python versions before 3.5.
+"""
+
+import asyncio
+import locale
+
+
+async def run(sultan, commands, env, halt_on_nonzero=True):
+    """
+    Runs `commands` in a shell without blocking the event loop, and returns a
+    `Result` the same way `Sultan.run()` does.
+    """
+    stdout, stderr = None, None
+
+    try:
+        process = await asyncio.create_subprocess_shell(
+            commands,
+            env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE)
+        stdout, stderr = await process.communicate()
+
+        # decode like 'universal_newlines=True' does for 'Sultan.run()'
+        encoding = locale.getpreferredencoding(False)
+        stdout, stderr = stdout.decode(encoding), stderr.decode(encoding)
+        return sultan._result(stdout, stderr)
+
+    except Exception:
+        result = sultan._failed_result(commands, stdout, stderr)
+
+        # halt on error if it is requested
+        if sultan.settings.HALT_ON_ERROR:
+            if halt_on_nonzero:
+                raise
+
+        if halt_on_nonzero:
+            raise
+
+        return result
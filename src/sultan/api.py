@@ -51,9 +51,13 @@ Want to get started? Simply install Sultan, and start writing your clean code::
 If you have more questions, check the docs! http://sultan.readthedocs.io/en/latest/
 """
 
+import errno
 import getpass
 import os
+import select
+import shlex
 import subprocess
+import threading
 import traceback
 import sys
 
@@ -68,6 +72,38 @@ __all__ = ['Sultan']
 if sys.version_info < (3, 0):
     input = raw_input
 
+# 'async def' is a syntax error before Python 3.5, so it lives in its own module
+if sys.version_info >= (3, 5):
+    from . import _async
+else:
+    _async = None
+
+# resolving the current user can hit NSS (LDAP, SSSD, ...), so we only do it
+# once, the first time sudo or ssh needs it, and reuse it; call
+# `Sultan.refresh_user()` if it changes at runtime.
+_CURRENT_USER = None
+
+# bumped by `Sultan.refresh_user()`, so rendered prefixes that hold the old user
+# are rebuilt
+_USER_GENERATION = 0
+
+
+def _current_user():
+    global _CURRENT_USER
+    if _CURRENT_USER is None:
+        _CURRENT_USER = getpass.getuser()
+    return _CURRENT_USER
+
+# commands containing any of these characters need '/bin/sh' to interpret them,
+# and builtins only exist inside a shell, so neither can be exec'd directly.
+_SHELL_METACHARS = frozenset('|&;<>()$`\\"\'*?[]{}~#!\n')
+_SHELL_BUILTINS = frozenset([
+    '.', 'alias', 'bg', 'builtin', 'cd', 'command', 'declare', 'dirs', 'eval',
+    'exec', 'exit', 'export', 'fg', 'hash', 'history', 'jobs', 'let', 'local',
+    'popd', 'pushd', 'read', 'readonly', 'return', 'set', 'shift', 'shopt',
+    'source', 'trap', 'type', 'ulimit', 'umask', 'unalias', 'unset', 'wait',
+])
+
 
 class Sultan(Base):
     """
@@ -78,7 +114,7 @@ class Sultan(Base):
     def load(cls, 
         cwd=None, sudo=False, user=None, 
         hostname=None, env=None, logging=True, 
-        ssh_config=None, src=None, 
+        ssh_config=None, src=None, persistent=False,
         **kwargs):
 
         # initial checks
@@ -87,34 +123,50 @@ class Sultan(Base):
                 ssh_config
             raise ValueError(msg)
 
-        if src and not os.path.exists(src):
-            raise IOError("The Source File provided (%s) does not exist" % src)
+        if src:
+            try:
+                os.stat(src)
+            except OSError:
+                raise IOError("The Source File provided (%s) does not exist" % src)
 
         context = {}
         context['cwd'] = cwd
         context['sudo'] = sudo
         context['hostname'] = hostname
-        context['ssh_config'] = str(ssh_config) if ssh_config else ''
+        # stored ready to be spliced in between 'ssh' and 'user@hostname'
+        ssh_config = str(ssh_config) if ssh_config else ''
+        context['ssh_config'] = " %s " % ssh_config if ssh_config else " "
         context['env'] = env or None # must be None, for Python to get the current process's env.
         context['logging'] = logging
         context['src'] = src
 
-        # determine user
-        if user:
-            context['user'] = user
-        else:
-            context['user'] = getpass.getuser()
+        # the user is only needed for sudo and ssh, so when it isn't given, the
+        # current user is looked up when the commands are rendered
+        context['user'] = user
         context.update(kwargs)
 
-        return cls(context=context)
+        return cls(context=context, persistent=persistent)
+
+    @staticmethod
+    def refresh_user():
+        """
+        Forgets the current user, which Sultan caches the first time it is
+        needed, so that it is looked up again.
+        """
+        global _CURRENT_USER, _USER_GENERATION
+        _CURRENT_USER = None
+        _USER_GENERATION += 1
 
-    def __init__(self, context=None):
+    def __init__(self, context=None, persistent=False):
 
         self.commands = []
+        self.persistent = persistent
+        self._shell = None
         self._context = [context] if context is not None else []
         self.logging_activated = context.get('logging') if context else False
         self._echo = Echo(activated=self.logging_activated)
         self.settings = Settings()
+        self._prefix_cache = None
 
     @property
     def current_context(self):
@@ -146,6 +198,7 @@ class Sultan(Base):
         # however, we do want to alert the user that they're using contexts badly.
         if len(self._context) == 0:
             raise InvalidContextError("You're using the 'with' block to load Sultan, but didn't provide a context with 'Sultan.context(...)'")
+        self._prefix_cache = None
         return self
 
     def __exit__(self, type, value, traceback):
@@ -154,6 +207,11 @@ class Sultan(Base):
         """
         if len(self._context) > 0:
             self._context.pop()
+        self._prefix_cache = None
+
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
 
     def __call__(self):
 
@@ -167,18 +225,29 @@ class Sultan(Base):
 
     def __getattr__(self, name):
 
-        if name == "redirect":
-            return Redirect(self, name)
-        else:
-            # When calling Bash Commands from Python with Sultan, we encounter
-            # an issue where the Python doesn't allow special characters like 
-            # dashes (i.e.: apt-get). To get around this, we will use 2 
-            # underscores one after another to indicate that we want it to be a
-            # dash, and replace it accordingly before calling Command
+        # When calling Bash Commands from Python with Sultan, we encounter
+        # an issue where the Python doesn't allow special characters like 
+        # dashes (i.e.: apt-get). To get around this, we will use 2 
+        # underscores one after another to indicate that we want it to be a
+        # dash, and replace it accordingly before calling Command
+        if '__' in name:
             name = name.replace('__', '-')
 
-            # call Command()
-            return Command(self, name)
+        # call Command()
+        return Command(self, name)
+
+    @property
+    def redirect(self):
+        """
+        Redirects the output of the previous command to a file.
+
+        Usage::
+
+            # runs: 'echo "Hello" 1> /tmp/hello.txt'
+            s = Sultan()
+            s.echo('"Hello"').redirect('/tmp/hello.txt', stdout=True).run()
+        """
+        return Redirect(self, "redirect")
 
     def run(self, halt_on_nonzero=True, quiet=False, q=False):
         """
@@ -190,42 +259,28 @@ class Sultan(Base):
             self._echo.cmd(commands)
 
         stdout, stderr = None, None
-        env = self._context[0].get('env', {}) if len(self._context) > 0 else os.environ
+        env = self._env()
 
         try:
-            stdout, stderr = subprocess.Popen(commands,
-                                              shell=True,
-                                              env=env,
-                                              stdin=subprocess.PIPE,
-                                              stdout=subprocess.PIPE,
-                                              stderr=subprocess.PIPE,
-                                              universal_newlines=True).communicate()
-            result = Result(stdout, stderr)
-
-            if result.stdout:
-                return result 
-
-            if result.stderr:
-                result.print_stderr()
-                
-            return result
+            if self.persistent:
+                if self._shell is None:
+                    self._shell = _PersistentShell(env=env)
+                try:
+                    stdout, stderr = self._shell.run(commands)
+                except BaseException:
+                    # the shell is dead, or out of step with us because the
+                    # read was cut short (i.e.: KeyboardInterrupt), so the next
+                    # run() starts a new one
+                    self._shell.close(kill=True)
+                    self._shell = None
+                    raise
+            else:
+                argv = self._simple_argv()
+                stdout, stderr = self._spawn(commands, argv, env).communicate()
+            return self._result(stdout, stderr)
 
         except Exception:
-            tb = traceback.format_exc().split("\n")
-
-            self._echo.critical("Unable to run '%s'" % commands)
-            result = Result(stdout, stderr, traceback=tb)
-
-            #  traceback
-            result.print_traceback()
-
-            # standard out
-            if result.stdout:
-                result.print_stdout()
-
-            # standard error
-            if result.stderr:
-                result.print_stderr()
+            result = self._failed_result(commands, stdout, stderr)
 
             # halt on error if it is requested
             if self.settings.HALT_ON_ERROR:
@@ -242,6 +297,221 @@ class Sultan(Base):
             # clear the buffer
             self.clear()
 
+    def run_async(self, halt_on_nonzero=True, quiet=False, q=False):
+        """
+        Like `run()`, but returns a coroutine that runs the commands with
+        asyncio, so many of them can run at once (Python 3.5+ only). Each call
+        starts a new process, even with `Sultan.load(persistent=True)`.
+
+        Usage::
+
+            # runs: 'ssh <user>@<host> 'uptime;'' on all hosts at once
+            sultans = [Sultan.load(hostname=host) for host in hosts]
+            results = loop.run_until_complete(asyncio.gather(
+                *[s.uptime().run_async() for s in sultans]))
+        """
+        if _async is None:
+            raise NotImplementedError("run_async() requires Python 3.5 or later.")
+
+        commands = str(self)
+        if not (quiet or q):
+            self._echo.cmd(commands)
+
+        # the commands are taken now, so the buffer can be reused right away
+        self.clear()
+        return _async.run(self, commands, self._env(), halt_on_nonzero)
+
+    def _result(self, stdout, stderr):
+        """
+        Wraps the output of a command that ran in a `Result`.
+        """
+        result = Result(stdout, stderr)
+
+        if result.stdout:
+            return result 
+
+        if result.stderr:
+            result.print_stderr()
+            
+        return result
+
+    def _failed_result(self, commands, stdout, stderr):
+        """
+        Logs the details of a command that could not run, and returns them as a
+        `Result`. Must be called while handling the exception.
+        """
+        tb = traceback.format_exc().split("\n")
+
+        self._echo.critical("Unable to run '%s'" % commands)
+        result = Result(stdout, stderr, traceback=tb)
+
+        #  traceback
+        result.print_traceback()
+
+        # standard out
+        if result.stdout:
+            result.print_stdout()
+
+        # standard error
+        if result.stderr:
+            result.print_stderr()
+
+        return result
+
+    def run_iter(self, stdin=None, chunk_size=64 * 1024, quiet=False, q=False):
+        """
+        Like `run()`, but instead of collecting the output into a `Result`, it
+        returns a generator that yields `(chunk, stream)` tuples as the command
+        produces them, where `chunk` is bytes and `stream` is either 'stdout'
+        or 'stderr'. Memory use stays flat no matter how much output there is.
+        The command starts when the generator is first iterated.
+
+        `stdin` can be an iterable of bytes to feed to the command, including
+        the output of another `run_iter()` (only its 'stdout' chunks are fed).
+
+        Usage::
+
+            s = Sultan()
+            for chunk, stream in s.tar('-cf', '-', '/var/log').run_iter():
+                ...
+
+            # runs: 'cat /var/log/syslog' and feeds its output to 'grep sshd'
+            logs = Sultan().cat('/var/log/syslog').run_iter()
+            for chunk, stream in Sultan().grep('sshd').run_iter(stdin=logs):
+                ...
+        """
+        commands = str(self)
+        if not (quiet or q):
+            self._echo.cmd(commands)
+
+        argv, env = self._simple_argv(), self._env()
+
+        # the commands are taken now, so the buffer can be reused right away,
+        # but the process is only started by the generator: one that is never
+        # iterated has nothing to clean up
+        self.clear()
+        return self._iter_process(commands, argv, env, stdin, chunk_size)
+
+    def _iter_process(self, commands, argv, env, stdin, chunk_size):
+        """
+        Starts `commands` and yields its output as it comes in, while feeding it
+        `stdin`.
+        """
+        process = self._spawn(commands, argv, env, universal_newlines=False)
+
+        try:
+            readers = {
+                process.stdout.fileno(): 'stdout',
+                process.stderr.fileno(): 'stderr',
+            }
+            writers = []
+            if stdin is None:
+                process.stdin.close()
+            else:
+                writers.append(process.stdin.fileno())
+                chunks = iter(stdin)
+                pending = b''
+
+            while readers or writers:
+                rlist, wlist, _ = select.select(list(readers), writers, [])
+
+                if wlist:
+                    while not pending and chunks is not None:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            chunks = None
+                        elif isinstance(chunk, tuple):
+                            pending = chunk[0] if chunk[1] == 'stdout' else b''
+                        else:
+                            pending = chunk
+
+                    if pending:
+                        try:
+                            # writes up to PIPE_BUF can't block once select
+                            # says the pipe is writable
+                            written = os.write(wlist[0], pending[:select.PIPE_BUF])
+                            pending = pending[written:]
+                        except OSError as e:
+                            # the command stopped reading its input
+                            if e.errno != errno.EPIPE:
+                                raise
+                            chunks, pending = None, b''
+
+                    if not pending and chunks is None:
+                        writers = []
+                        process.stdin.close()
+
+                for fd in rlist:
+                    chunk = os.read(fd, chunk_size)
+                    if not chunk:
+                        del readers[fd]
+                        continue
+                    yield chunk, readers[fd]
+
+            process.wait()
+
+        finally:
+            for stream in (process.stdin, process.stdout, process.stderr):
+                stream.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    def _env(self):
+        """
+        Returns the environment that commands run with. None (the default)
+        lets the process inherit ours, where an empty dict would clear it.
+        """
+        return self._context[0].get('env') if self._context else None
+
+    def _spawn(self, commands, argv, env, universal_newlines=True):
+        """
+        Starts `commands` in a new process and returns its `Popen`. When `argv`
+        (see `_simple_argv`) is given, it is exec'd without the shell.
+        """
+        if argv is not None:
+            try:
+                return self._popen(argv, env, False, universal_newlines)
+            except OSError as e:
+                # let the shell report missing commands and run scripts
+                # without a shebang, as it always has
+                if e.errno not in (errno.ENOENT, errno.EACCES, errno.ENOEXEC):
+                    raise
+
+        return self._popen(commands, env, True, universal_newlines)
+
+    def _popen(self, args, env, shell, universal_newlines):
+
+        return subprocess.Popen(args,
+                                shell=shell,
+                                env=env,
+                                stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                universal_newlines=universal_newlines)
+
+    def _simple_argv(self):
+        """
+        Returns the argument list for a lone command that can be exec'd without
+        going through '/bin/sh', or None if the shell is needed (operators,
+        context wrapping, builtins or shell syntax).
+        """
+        if len(self.commands) != 1 or not isinstance(self.commands[0], Command):
+            return None
+
+        if self._render_prefix_suffix() != ("", ""):
+            return None
+
+        cmd_str = str(self.commands[0])
+        if _SHELL_METACHARS.intersection(cmd_str):
+            return None
+
+        argv = shlex.split(cmd_str)
+        if not argv or argv[0] in _SHELL_BUILTINS or '=' in argv[0]:
+            return None
+
+        return argv
+
     def _add(self, command):
         """
         Private method that adds a custom command (see `pipe` and `and_`).
@@ -253,70 +523,84 @@ class Sultan(Base):
 
     def clear(self):
 
-        del self.commands[:]
+        # a new list, rather than emptying the old one, lets go of the memory
+        # a long chain of commands needed
+        self.commands = []
         return self
 
     def __str__(self):
         """
         Returns the chained commands that were built as a string.
         """
-        context = self.current_context
-        SPECIAL_CASES = (Pipe, And, Redirect, Or)
-        output = ""
+        prefix, suffix = self._render_prefix_suffix()
+        return prefix + self._render_body() + suffix
+
+    def _render_body(self):
+        """
+        Renders the chained commands, without any of the context wrapping.
+        """
+        parts = []
+        prev_operator = False
         for i, cmd in enumerate(self.commands):
 
-            if (i == 0):
-                separator = ""
-            else:
-                if isinstance(cmd, SPECIAL_CASES):
-                    separator = " "
-                else:
-                    if isinstance(self.commands[i - 1], SPECIAL_CASES):
-                        separator = " "
-                    else:
-                        separator = "; "
+            is_operator = cmd._is_operator
+            if i > 0:
+                parts.append(" " if (is_operator or prev_operator) else "; ")
+            parts.append(str(cmd))
+            prev_operator = is_operator
+
+        return "".join(parts).strip() + ";"
 
-            cmd_str = str(cmd)
-            output += separator + cmd_str
+    def _render_prefix_suffix(self):
+        """
+        Returns the `(prefix, suffix)` that wraps the rendered commands for the
+        current context (cwd, src, sudo and ssh). This is cached until the
+        context changes or `Sultan.refresh_user()` is called.
+        """
+        if self._prefix_cache is not None and self._prefix_cache[0] == _USER_GENERATION:
+            return self._prefix_cache[1:]
 
-        output = output.strip() + ";"
+        context = self.current_context
+        prefix, suffix = "", ""
 
         # update with 'cwd' context
         cwd = context.get('cwd')
         if cwd:
-            prepend = "cd %s && " % (cwd)
-            output = prepend + output
+            prefix = "cd %s && " % (cwd) + prefix
 
         # update with 'src' context
         src = context.get('src')
         if src:
-            prepend = "source %s && " % (src)
-            output = prepend + output
+            prefix = "source %s && " % (src) + prefix
 
         # update with 'sudo' context
         sudo = context.get('sudo')
-        user = context.get('user')
         if sudo:
-            if user != getpass.getuser():
-                output = "sudo su - %s -c '%s'" % (user, output)
-            elif getpass.getuser() == 'root':
-                output = "su - %s -c '%s'" % (user, output)
+            current_user = _current_user()
+            user = context.get('user') or current_user
+            if user != current_user:
+                prefix = "sudo su - %s -c '" % (user) + prefix
+                suffix = suffix + "'"
+            elif current_user == 'root':
+                prefix = "su - %s -c '" % (user) + prefix
+                suffix = suffix + "'"
             else:
-                output = "sudo %s" % (output)
+                prefix = "sudo " + prefix
 
         # if we have to ssh, prepare for the SSH command
         ssh_config = context.get('ssh_config')
         hostname = context.get('hostname')
         if hostname:
-            params = {
-                'user': user,
-                'hostname': hostname,
-                'command': output, 
-                'ssh_config': ' %s ' % ssh_config if ssh_config else ' '
-            }
-            output = "ssh%(ssh_config)s%(user)s@%(hostname)s '%(command)s'" % (params)
+            user = context.get('user') or _current_user()
+            ssh_config = ssh_config or " "
+            if not (ssh_config.startswith(" ") and ssh_config.endswith(" ")):
+                # contexts built by hand can hold the config unpadded
+                ssh_config = " %s " % ssh_config
+            prefix = "ssh%s%s@%s '" % (ssh_config, user, hostname) + prefix
+            suffix = suffix + "'"
 
-        return output
+        self._prefix_cache = (_USER_GENERATION, prefix, suffix)
+        return prefix, suffix
 
     def spit(self):
         """
@@ -367,6 +651,97 @@ class Sultan(Base):
 
         return input(message)
 
+class _PersistentShell(Base):
+    """
+    A long-lived `bash` process that runs the commands written to its stdin, so
+    consecutive `Sultan.run()` calls don't each pay for starting a new shell.
+    Used by `Sultan.load(persistent=True)`.
+    """
+
+    SENTINEL = '__SULTAN_EOF__'
+
+    def __init__(self, env=None):
+
+        self.returncode = None
+
+        # the output is read with readline() on the file objects, so they need
+        # a buffer (Python 2 defaults to unbuffered)
+        self.process = subprocess.Popen(['/bin/bash', '--noprofile', '--norc'],
+                                        shell=False,
+                                        env=env,
+                                        bufsize=-1,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE,
+                                        universal_newlines=True)
+
+    def run(self, commands):
+        """
+        Runs `commands` and returns its `(stdout, stderr)`.
+        """
+        # the commands run in a subshell with no stdin, so they can't change the
+        # shell's state (cwd, env, exit) or read the sentinels. They are handed
+        # to 'eval' as one quoted word, so a syntax error (i.e.: an unbalanced
+        # quote) stays inside them instead of swallowing the sentinels. Each
+        # sentinel starts on a new line, and that extra newline is dropped when
+        # reading.
+        script = "( eval '%s' ) < /dev/null\n" % commands.replace("'", "'\\''")
+        script += "printf '\\n%s%%s__\\n' \"$?\"\n" % self.SENTINEL
+        script += "printf '\\n%s\\n' 1>&2\n" % self.SENTINEL
+        self.process.stdin.write(script)
+        self.process.stdin.flush()
+
+        # drain stderr on its own thread so that neither pipe can fill up and
+        # block the shell while we are waiting on the other one
+        stderr = []
+        reader = threading.Thread(target=lambda: stderr.append(
+            self._read_until_sentinel(self.process.stderr)))
+        reader.daemon = True
+        reader.start()
+        stdout, sentinel = self._read_until_sentinel(self.process.stdout)
+        reader.join()
+
+        if not stderr or stderr[0][1] is None or sentinel is None:
+            raise IOError("The persistent shell exited unexpectedly.")
+
+        self.returncode = int(sentinel[len(self.SENTINEL):].rstrip().rstrip('_'))
+        return stdout, stderr[0][0]
+
+    def _read_until_sentinel(self, stream):
+        """
+        Reads `stream` up to the sentinel line, and returns the output and the
+        sentinel line (None if the shell went away first).
+        """
+        lines = []
+        while True:
+            line = stream.readline()
+            if not line:
+                return ''.join(lines), None
+            if line.startswith(self.SENTINEL):
+                return ''.join(lines)[:-1], line
+            lines.append(line)
+
+    def close(self, kill=False):
+        """
+        Ends the shell, killing it first if `kill` is set.
+        """
+        if kill and self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.process.stdin.close()
+        except (IOError, OSError):
+            pass  # the shell is already gone
+        self.process.wait()
+        self.process.stdout.close()
+        self.process.stderr.close()
+
+    def __del__(self):
+
+        # persistent Sultans used without a 'with' block never reach __exit__
+        if getattr(self, 'process', None) is not None and self.process.poll() is None:
+            self.close()
+
+
 class BaseCommand(Base):
     """
     The Base class for all commands.
@@ -377,6 +752,10 @@ class BaseCommand(Base):
     kwargs = None
     context = None
 
+    # operators (|, &&, ||, >) are joined to their neighbours with a space
+    # instead of a ';'
+    _is_operator = False
+
     def __init__(self, sultan, name, context=None):
 
         self.sultan = sultan
@@ -392,19 +771,25 @@ class Command(BaseCommand):
     `Sultan().foo()`, `foo` is represented as an instance of `Command`.
 
     """
+
+    # the rendered command, cached by `__str__` once args and kwargs are set
+    _rendered = None
+
     def __call__(self, *args, **kwargs):
 
         # check for 'where' in kwargs
         if 'where' in kwargs:
             where = kwargs.pop('where')
-            if not os.path.exists(where):
-                raise IOError("The value for 'where' (%s), for '%s' does not exist." % (where, self.command))
-
             cmd = os.path.join(where, self.command)
-            if not os.path.exists(cmd):
+            try:
+                os.stat(cmd)
+            except OSError:
+                # only look at 'where' when we need to explain what's missing
+                if not os.path.isdir(where):
+                    raise IOError("The value for 'where' (%s), for '%s' does not exist." % (where, self.command))
                 raise IOError("Command '%s' does not exist in '%s'." % (cmd, where))
 
-            self.command = os.path.join(where, cmd)
+            self.command = cmd
 
         if "sudo" in kwargs:
             kwargs.pop("sudo")
@@ -412,31 +797,24 @@ class Command(BaseCommand):
 
         self.args = [str(a) for a in args]
         self.kwargs = kwargs
+        self._rendered = None
         self.sultan._add(self)
         return self.sultan
 
     def __str__(self):
 
-        args_str = (" ".join(self.args)).strip()
-        kwargs_list = []
-        for k, v in self.kwargs.items():
+        if self._rendered is not None:
+            return self._rendered
 
-            key = None
-            value = v
-            if len(k) == 1:
-                key = "-%s" % k
-            else:
-                key = "--%s" % k
-            kwargs_list.append("%s=%s" % (key, value))
-        kwargs_str = " ".join(kwargs_list).strip()
+        kwargs_list = [
+            ("-%s=%s" if len(k) == 1 else "--%s=%s") % (k, v)
+            for k, v in self.kwargs.items()
+        ]
 
-        # prep and return the output
-        output = self.command
-        if len(kwargs_str) > 0:
-            output += " " + kwargs_str
-        if len(args_str) > 0:
-            output += " " + args_str
+        # empty args (i.e.: `s.ls('')`) are dropped instead of leaving a stray space
+        output = " ".join(filter(None, [self.command] + kwargs_list + self.args))
 
+        self._rendered = output
         return output
 
 
@@ -444,6 +822,8 @@ class Pipe(BaseCommand):
     """
     Representation of the Pipe `|` operator.
     """
+    _is_operator = True
+
     def __call__(self):
 
         pass  # do nothing
@@ -457,6 +837,8 @@ class And(BaseCommand):
     """
     Representation of the And `&&` operator.
     """
+    _is_operator = True
+
     def __call__(self):
 
         pass  # do nothing
@@ -470,6 +852,8 @@ class Or(BaseCommand):
     """
     Representation of the Or `||` operator.
     """
+    _is_operator = True
+
     def __call__(self):
 
         pass  # do nothing
@@ -483,6 +867,8 @@ class Redirect(BaseCommand):
     """
     Representation of the Redirect (`>`, `>>`, ...) operator.
     """
+    _is_operator = True
+
     def __call__(self, to_file, append=False, stdout=False, stderr=False):
 
         descriptor = None
@@ -516,31 +902,58 @@ class Config(object):
 
     def __str__(self):
 
-        output = []
-        for key, value in self.config.items():
+        shorthand = self._shorthand()
+        return ' '.join(
+            '%s %s' % (shorthand[key], value)
+            for key, value in self.config.items())
 
-            shorthand = self.params_map[key]['shorthand']
-            output.append(shorthand)
-            output.append(str(value))
-            
-        return ' '.join(output)
+    @classmethod
+    def _shorthand(cls):
+        '''
+        Returns a map of each key in `params_map` to its shorthand, built once
+        for each subclass.
+        '''
+        shorthand = cls.__dict__.get('_shorthand_map')
+        if shorthand is None:
+            shorthand = cls._shorthand_map = dict(
+                (key, key_config['shorthand'])
+                for key, key_config in cls.params_map.items())
+        return shorthand
+
+    @classmethod
+    def _param_keys(cls):
+        '''
+        Returns the required and the allowed keys of `params_map`, as sets.
+        These are worked out once for each subclass.
+        '''
+        keys = cls.__dict__.get('_keys')
+        if keys is None:
+            required = frozenset(
+                key for key, key_config in cls.params_map.items()
+                if key_config['required'])
+            keys = cls._keys = (required, frozenset(cls.params_map))
+        return keys
 
     def validate_config(self):
         '''
         Validates the provided config to make sure all the required fields are 
         there.
         '''
+        required_keys, allowed_keys = self._param_keys()
+        provided_keys = set(self.config)
+
         # first ensure that all the required fields are there
-        for key, key_config in self.params_map.items():
-            if key_config['required']:
-                if key not in self.config:
-                    raise ValueError("Invalid Configuration! Required parameter '%s' was not provided to Sultan.")
+        missing = required_keys - provided_keys
+        if missing:
+            raise ValueError("Invalid Configuration! Required parameter(s) %s were not provided to Sultan." % \
+                ', '.join("'%s'" % key for key in sorted(missing)))
         
         # second ensure that the fields that were pased were actually fields that
         # can be used
-        for key in self.config.keys():
-            if key not in self.params_map:
-                raise ValueError("Invalid Configuration! The parameter '%s' provided is not used by Sultan!" % key)
+        unknown = provided_keys - allowed_keys
+        if unknown:
+            raise ValueError("Invalid Configuration! The parameter(s) %s provided are not used by Sultan!" % \
+                ', '.join("'%s'" % key for key in sorted(unknown)))
 
 
 
@@ -2,10 +2,13 @@ import logging
 import mock
 import os
 import shutil
+import signal
 import subprocess
+import sys
 import tempfile
 import unittest
 import getpass
+import gc
 
 from sultan.api import And, Or, Command, Pipe, Redirect, Sultan, SSHConfig
 from sultan.config import Settings
@@ -36,6 +39,145 @@ class SultanTestCase(unittest.TestCase):
         self.assertTrue(m_subprocess.Popen().communicate.called)
         self.assertEqual(response.stdout, ["sample_response"])
 
+    def test_simple_argv(self):
+
+        self.assertEqual(Sultan().ls("-lah /tmp")._simple_argv(), ['ls', '-lah', '/tmp'])
+        self.assertEqual(Sultan().ls("/tmp", sudo=True)._simple_argv(), ['sudo', 'ls', '/tmp'])
+        self.assertIsNone(Sultan().ls("/tmp").and_().ls("/var")._simple_argv())
+        self.assertIsNone(Sultan().ls("/tmp/*")._simple_argv())
+        self.assertIsNone(Sultan().echo("$HOME")._simple_argv())
+        self.assertIsNone(Sultan().cd("/tmp")._simple_argv())
+        self.assertIsNone(Sultan.load(cwd='/tmp').ls()._simple_argv())
+
+    def test_run_missing_command_falls_back_to_shell(self):
+
+        response = Sultan().sultan__missing__command().run(halt_on_nonzero=False)
+        self.assertTrue(response.stderr)
+
+    def test_run_persistent(self):
+
+        with Sultan.load(persistent=True) as s:
+            self.assertEqual(s.echo("-n foo").run().stdout, ['foo'])
+            self.assertEqual(s.cd('/').and_().pwd().run().stdout, ['/'])
+            self.assertEqual(s.pwd().run().stdout, [os.getcwd()])
+
+            response = s.ls('/sultan/does/not/exist').run()
+            self.assertEqual(response.stdout, '')
+            self.assertTrue(response.stderr)
+            self.assertNotEqual(s._shell.returncode, 0)
+
+            shell = s._shell
+
+        self.assertIsNone(s._shell)
+        self.assertIsNotNone(shell.process.returncode)
+
+    def test_run_persistent_syntax_error(self):
+
+        with Sultan.load(persistent=True) as s:
+            response = s.echo('"foo').run(halt_on_nonzero=False)
+            self.assertEqual(response.stdout, '')
+            self.assertTrue(response.stderr)
+
+            self.assertEqual(s.echo("'bar'").run().stdout, ['bar'])
+
+    def test_run_persistent_shell_dies(self):
+
+        with Sultan.load(persistent=True) as s:
+            s.echo('foo').run()
+            shell = s._shell
+
+            # '$$' is the persistent shell itself, not the subshell
+            s.kill('-9 $$').run(halt_on_nonzero=False)
+            self.assertIsNone(s._shell)
+            self.assertIsNotNone(shell.process.returncode)
+
+            self.assertEqual(s.echo('foo').run().stdout, ['foo'])
+
+    def test_run_persistent_interrupted(self):
+
+        def interrupt(signum, frame):
+            raise KeyboardInterrupt()
+
+        handler = signal.signal(signal.SIGALRM, interrupt)
+        try:
+            with Sultan.load(persistent=True) as s:
+                signal.setitimer(signal.ITIMER_REAL, 0.2)
+                with self.assertRaises(KeyboardInterrupt):
+                    s.sleep('1').and_().echo('first').run()
+                self.assertIsNone(s._shell)
+
+                self.assertEqual(s.echo('second').run().stdout, ['second'])
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, handler)
+
+    def test_run_persistent_without_context(self):
+
+        s = Sultan.load(persistent=True)
+        s.echo('foo').run()
+        process = s._shell.process
+
+        del s
+        gc.collect()
+        self.assertIsNotNone(process.returncode)
+
+    def test_run_iter(self):
+
+        s = Sultan()
+        output = list(s.echo('foo').and_().ls('/sultan/does/not/exist').run_iter())
+        self.assertEqual(len(s.commands), 0)
+        self.assertEqual(b''.join(c for c, stream in output if stream == 'stdout'), b'foo\n')
+        self.assertTrue(b''.join(c for c, stream in output if stream == 'stderr'))
+
+    def test_run_iter_not_iterated(self):
+
+        handle, filepath = tempfile.mkstemp()
+        os.close(handle)
+        os.unlink(filepath)
+        try:
+            s = Sultan()
+            output = s.touch(filepath).run_iter()
+            self.assertEqual(len(s.commands), 0)
+
+            # dropping the generator unused never starts the command
+            del output
+            gc.collect()
+            self.assertFalse(os.path.exists(filepath))
+        finally:
+            if os.path.exists(filepath):
+                os.unlink(filepath)
+
+    def test_run_iter_stdin(self):
+
+        numbers = Sultan().seq('1 100000').run_iter()
+        output = Sultan().wc('-l').run_iter(stdin=numbers)
+        self.assertEqual(b''.join(c for c, stream in output).strip(), b'100000')
+
+        output = Sultan().cat().run_iter(stdin=[b'foo', b'bar'])
+        self.assertEqual(list(output), [(b'foobar', 'stdout')])
+
+    @unittest.skipIf(sys.version_info < (3, 5), "run_async() requires Python 3.5+")
+    def test_run_async(self):
+
+        import asyncio
+
+        s1 = Sultan()
+        s2 = Sultan()
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            responses = loop.run_until_complete(asyncio.gather(
+                s1.echo('foo').run_async(),
+                s2.echo('bar').and_().ls('/sultan/does/not/exist').run_async()))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        self.assertEqual(len(s1.commands), 0)
+        self.assertEqual(responses[0].stdout, ['foo'])
+        self.assertEqual(responses[1].stdout, ['bar'])
+        self.assertTrue(responses[1].stderr)
+
     def test_run_advanced(self):
 
         sultan = Sultan()
@@ -118,6 +260,13 @@ class SultanTestCase(unittest.TestCase):
         self.assertEqual(str(sultan.touch('/tmp/foobar').or_().echo('"Step Completed"')),
                          "touch /tmp/foobar || echo \"Step Completed\";")
 
+    def test_mixed_chain(self):
+
+        sultan = Sultan()
+        self.assertEqual(
+            str(sultan.cat('/tmp/foo').pipe().grep('bar').ls('/tmp').redirect('/tmp/baz', stdout=True)),
+            "cat /tmp/foo | grep bar; ls /tmp 1> /tmp/baz;")
+
     @mock.patch('sultan.api.input')
     def test_stdin(self, mock_input):
 
@@ -134,9 +283,9 @@ class SultanTestCase(unittest.TestCase):
             'sudo': False,
             'logging': True,
             'test_key': 'test_val',
-            'user': getpass.getuser(),
+            'user': None,
             'hostname': None,
-            'ssh_config': '',
+            'ssh_config': ' ',
             'src': None
         })
 
@@ -147,9 +296,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': None, 
                 'sudo': False, 
                 'logging': True, 
-                'user': getpass.getuser(), 
+                'user': None,
                 'hostname': None,
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -160,9 +309,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': None, 
                 'sudo': True, 
                 'logging': True, 
-                'user': getpass.getuser(), 
+                'user': None,
                 'hostname': None,
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -174,7 +323,7 @@ class SultanTestCase(unittest.TestCase):
                 'logging': True, 
                 'user': 'hodor', 
                 'hostname': None,
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -185,9 +334,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': None,
                 'sudo': True, 
                 'logging': True, 
-                'user': getpass.getuser(), 
+                'user': None,
                 'hostname': None,
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -199,9 +348,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': None, 
                 'sudo': False, 
                 'logging': True, 
-                'user': getpass.getuser(), 
+                'user': None,
                 'hostname': 'localhost',
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -212,9 +361,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': {'path': ''}, 
                 'sudo': False, 
                 'logging': True, 
-                'user': getpass.getuser(), 
+                'user': None,
                 'hostname': None,
-                'ssh_config': '',
+                'ssh_config': ' ',
                 'src': None
             })
 
@@ -226,9 +375,9 @@ class SultanTestCase(unittest.TestCase):
                 'env': None,
                 'sudo': False,
                 'logging': True,
-                'user': getpass.getuser(),
+                'user': None,
                 'hostname': None,
-                'ssh_config': '-p 2222',
+                'ssh_config': ' -p 2222 ',
                 'src': None
             })
 
@@ -241,9 +390,9 @@ class SultanTestCase(unittest.TestCase):
                     'env': None,
                     'sudo': False,
                     'logging': True,
-                    'user': getpass.getuser(),
+                    'user': None,
                     'hostname': None,
-                    'ssh_config': '',
+                    'ssh_config': ' ',
                     'src': filepath
                 })
         finally:
@@ -251,11 +400,61 @@ class SultanTestCase(unittest.TestCase):
                 os.unlink(filepath)
 
 
+    @mock.patch('sultan.api.getpass')
+    def test_refresh_user(self, m_getpass):
+
+        m_getpass.getuser.return_value = 'hodor'
+        try:
+            Sultan.refresh_user()
+            with Sultan.load(hostname='google.com') as s:
+                self.assertEqual(str(s.ls()), "ssh hodor@google.com 'ls;'")
+        finally:
+            m_getpass.getuser.return_value = getpass.getuser()
+            Sultan.refresh_user()
+
+    @mock.patch('sultan.api.getpass')
+    def test_refresh_user_rerenders_prefix(self, m_getpass):
+
+        m_getpass.getuser.return_value = 'hodor'
+        Sultan.refresh_user()
+        try:
+            s = Sultan.load(hostname='google.com')
+            self.assertEqual(str(s.ls()), "ssh hodor@google.com 'ls;'")
+
+            m_getpass.getuser.return_value = 'bran'
+            Sultan.refresh_user()
+            self.assertEqual(str(s.clear().ls()), "ssh bran@google.com 'ls;'")
+        finally:
+            m_getpass.getuser.return_value = getpass.getuser()
+            Sultan.refresh_user()
+
+    @mock.patch('sultan.api.getpass')
+    def test_user_is_resolved_lazily(self, m_getpass):
+
+        m_getpass.getuser.side_effect = KeyError('getpwuid(): uid not found')
+        Sultan.refresh_user()
+        try:
+            self.assertEqual(str(Sultan().ls('/tmp')), 'ls /tmp;')
+            self.assertEqual(str(Sultan.load(cwd='/tmp').ls()), 'cd /tmp && ls;')
+            self.assertFalse(m_getpass.getuser.called)
+        finally:
+            Sultan.refresh_user()
+
     def test_context_for_pwd(self):
 
         with Sultan.load(cwd='/tmp') as sultan:
             self.assertEqual(str(sultan.ls('-lah')), 'cd /tmp && ls -lah;')
 
+    def test_context_prefix_cache(self):
+
+        sultan = Sultan.load(cwd='/tmp')
+        self.assertEqual(str(sultan.ls('-lah')), 'cd /tmp && ls -lah;')
+        self.assertEqual(str(sultan.ls('-1')), 'cd /tmp && ls -lah; ls -1;')
+
+        with sultan:
+            pass
+        self.assertEqual(str(sultan.clear().ls('-1')), 'ls -1;')
+
     def test_calling_context_sudo(self):
 
         # no sudo
@@ -310,6 +509,16 @@ class SultanTestCase(unittest.TestCase):
             self.assertEqual(str(sultan.ls('-lah', '/home')),
                             "ssh -p 2345 %s@google.com 'sudo su - obama -c \'ls -lah /home;\''" % user)
 
+    def test_calling_context_ssh_config(self):
+
+        with Sultan.load(hostname='google.com', user='obama', ssh_config=SSHConfig()) as sultan:
+            self.assertEqual(sultan.current_context['ssh_config'], ' ')
+            self.assertEqual(str(sultan.ls()), "ssh obama@google.com 'ls;'")
+
+        context = {'hostname': 'google.com', 'user': 'obama', 'ssh_config': '-p 22'}
+        with Sultan(context=context) as sultan:
+            self.assertEqual(str(sultan.ls()), "ssh -p 22 obama@google.com 'ls;'")
+
     def test_calling_context_wrongly(self):
 
         s = Sultan()
@@ -317,6 +526,15 @@ class SultanTestCase(unittest.TestCase):
             with Sultan() as s:
                 pass
 
+    def test_env_is_inherited(self):
+
+        self.assertIsNone(Sultan()._env())
+        self.assertIsNone(Sultan(context={'cwd': '/tmp'})._env())
+        self.assertEqual(Sultan.load(env={'FOO': 'bar'})._env(), {'FOO': 'bar'})
+
+        response = Sultan(context={'cwd': '/tmp'}).env().run()
+        self.assertIn('PATH=%s' % os.environ['PATH'], response.stdout)
+
     def test_clear_buffer_on_error(self):
 
         s = Sultan()
@@ -331,6 +549,13 @@ class SultanTestCase(unittest.TestCase):
             self.assertEqual(str(s.apt__get('install', 'httpd')),
                              'apt-get install httpd;')
 
+        with Sultan.load() as s:
+            self.assertEqual(str(s.docker__compose__v2('up')),
+                             'docker-compose-v2 up;')
+
+        with Sultan.load() as s:
+            self.assertEqual(str(s.yum_config('list')), 'yum_config list;')
+
     def test_src(self):
 
         handle, filepath = tempfile.mkstemp()
@@ -366,12 +591,80 @@ class SultanCommandTestCase(unittest.TestCase):
         command = Command(sultan, "yum")
         self.assertEqual(str(command), "yum")
 
+    def test_empty_args(self):
+
+        sultan = Sultan()
+        command = Command(sultan, "ls")
+        command("", "/tmp")
+        self.assertEqual(str(command), "ls /tmp")
+
+    def test_kwargs(self):
+
+        sultan = Sultan()
+        command = Command(sultan, "pip")
+        command("install", r="requirements.txt", upgrade=True)
+        self.assertEqual(str(command), "pip -r=requirements.txt --upgrade=True install")
+
+        # calling it again re-renders the command
+        command("freeze")
+        self.assertEqual(str(command), "pip freeze")
+
     def test_where_attribute(self):
 
         sultan = Sultan()
         command = Command(sultan, "df")
         self.assertEqual(str(command(where="/bin")), "/bin/df;")
 
+    def test_where_attribute_relative(self):
+
+        cwd = os.getcwd()
+        os.chdir('/')
+        try:
+            sultan = Sultan()
+            command = Command(sultan, "df")
+            self.assertEqual(str(command(where="bin")), "bin/df;")
+        finally:
+            os.chdir(cwd)
+
+    def test_where_attribute_missing(self):
+
+        sultan = Sultan()
+        with self.assertRaises(IOError):
+            Command(sultan, "df")(where="/sultan/does/not/exist")
+
+        with self.assertRaises(IOError):
+            Command(sultan, "sultan-does-not-exist")(where="/bin")
+
+
+class SSHConfigTestCase(unittest.TestCase):
+
+    def test_valid_config(self):
+
+        config = SSHConfig(identity_file='/tmp/key', port=2222)
+        self.assertEqual(config.config, {'identity_file': '/tmp/key', 'port': 2222})
+        self.assertEqual(str(config), '-i /tmp/key -p 2222')
+
+    def test_unknown_params(self):
+
+        with self.assertRaises(ValueError) as cm:
+            SSHConfig(port=2222, user='hodor', host='winterfell')
+        self.assertIn("'host', 'user'", str(cm.exception))
+
+    def test_missing_params(self):
+
+        class RequiredConfig(SSHConfig):
+            params_map = {
+                'port': {'shorthand': '-p', 'required': True},
+                'identity_file': {'shorthand': '-i', 'required': True},
+            }
+
+        with self.assertRaises(ValueError) as cm:
+            RequiredConfig()
+        self.assertIn("'identity_file', 'port'", str(cm.exception))
+
+        # the keys are worked out for each class on its own
+        SSHConfig()
+
 
 class PipeTestCase(unittest.TestCase):
 